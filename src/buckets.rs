@@ -0,0 +1,173 @@
+// Per-bit counters for building a simhash from a stream of feature hashes
+//
+// Every feature hash votes on each of the 64 output bits.  Rather than updating 64 u32
+// counters per feature, the kernels here count into 64 u8 lanes (one SIMD register's
+// worth, or two on AVX2) and widen into the u32 totals every 255 features, before
+// any lane can overflow.
+
+// Maximum number of features that can be counted into u8 lanes between flushes
+const BLOCK_SIZE: u32 = u8::MAX as u32;
+
+struct Buckets {
+    features: u32,
+    counts: [u32; 64],
+}
+
+impl Buckets {
+    fn new() -> Self {
+        Buckets { features: 0, counts: [0; 64] }
+    }
+
+    #[inline(always)]
+    fn flush(&mut self, lanes: &[u8; 64], features: u32) {
+        self.features += features;
+        for i in 0..64 {
+            self.counts[i] += lanes[i] as u32;
+        }
+    }
+
+    // A bit is set if more than half of the features had it set
+    fn finish(&self) -> u64 {
+        let threshold = self.features / 2;
+        self.counts.iter().enumerate().fold(0, |acc, (i, &b)| {
+            let bitval = (if b > threshold { 1 } else { 0 }) << i;
+            acc | bitval
+        })
+    }
+}
+
+pub fn simhash_buckets(hashes: impl Iterator<Item = u64>) -> u64 {
+    #[cfg(target_arch = "x86_64")]
+    if std::is_x86_feature_detected!("avx512bw") {
+        return unsafe { simhash_buckets_avx512(hashes) };
+    } else if std::is_x86_feature_detected!("avx2") {
+        return unsafe { simhash_buckets_avx2(hashes) };
+    }
+    simhash_buckets_scalar(hashes)
+}
+
+// Portable version, the inner loop is simple enough for the compiler to vectorise
+fn simhash_buckets_scalar(mut hashes: impl Iterator<Item = u64>) -> u64 {
+    let mut buckets = Buckets::new();
+    loop {
+        let mut lanes = [0u8; 64];
+        let mut block = 0;
+        while block < BLOCK_SIZE {
+            let Some(hash) = hashes.next() else { break };
+            for i in 0..64 {
+                lanes[i] += (hash >> i & 1) as u8;
+            }
+            block += 1;
+        }
+        buckets.flush(&lanes, block);
+        if block < BLOCK_SIZE {
+            return buckets.finish();
+        }
+    }
+}
+
+// Expands each half of the hash into 32 bytes: pshufb copies byte k of the half into
+// lanes 8k..8k+8, the and/cmpeq against a per-lane bit mask turns that into 0xff or 0x00
+// for each bit, and subtracting the mask (-1) from the counter adds one.
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2")]
+unsafe fn simhash_buckets_avx2(mut hashes: impl Iterator<Item = u64>) -> u64 {
+    use std::arch::x86_64::*;
+
+    let spread = _mm256_setr_epi8(
+        0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1,
+        2, 2, 2, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 3, 3, 3,
+    );
+    let bit_mask = _mm256_set1_epi64x(0x8040201008040201u64 as i64);
+
+    let mut buckets = Buckets::new();
+    loop {
+        let mut lo = _mm256_setzero_si256();
+        let mut hi = _mm256_setzero_si256();
+        let mut block = 0;
+        while block < BLOCK_SIZE {
+            let Some(hash) = hashes.next() else { break };
+            for (acc, half) in [(&mut lo, hash as u32), (&mut hi, (hash >> 32) as u32)] {
+                let bytes = _mm256_shuffle_epi8(_mm256_set1_epi32(half as i32), spread);
+                let set = _mm256_cmpeq_epi8(_mm256_and_si256(bytes, bit_mask), bit_mask);
+                *acc = _mm256_sub_epi8(*acc, set);
+            }
+            block += 1;
+        }
+        let mut lanes = [0u8; 64];
+        _mm256_storeu_si256(lanes.as_mut_ptr() as *mut __m256i, lo);
+        _mm256_storeu_si256(lanes.as_mut_ptr().add(32) as *mut __m256i, hi);
+        buckets.flush(&lanes, block);
+        if block < BLOCK_SIZE {
+            return buckets.finish();
+        }
+    }
+}
+
+// With AVX-512BW the hash needs no expansion at all: moved into a mask register, bit i
+// of the hash selects byte lane i, so a masked add of one updates all 64 counters.
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx512f,avx512bw")]
+unsafe fn simhash_buckets_avx512(mut hashes: impl Iterator<Item = u64>) -> u64 {
+    use std::arch::x86_64::*;
+
+    let ones = _mm512_set1_epi8(1);
+
+    let mut buckets = Buckets::new();
+    loop {
+        let mut acc = _mm512_setzero_si512();
+        let mut block = 0;
+        while block < BLOCK_SIZE {
+            let Some(hash) = hashes.next() else { break };
+            acc = _mm512_mask_add_epi8(acc, hash, acc, ones);
+            block += 1;
+        }
+        let mut lanes = [0u8; 64];
+        _mm512_storeu_si512(lanes.as_mut_ptr() as *mut __m512i, acc);
+        buckets.flush(&lanes, block);
+        if block < BLOCK_SIZE {
+            return buckets.finish();
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::util::random_hashes;
+
+    fn reference(hashes: &[u64]) -> u64 {
+        let threshold = hashes.len() as u32 / 2;
+        (0..64).fold(0, |acc, i| {
+            let count = hashes.iter().filter(|&&h| h >> i & 1 == 1).count() as u32;
+            acc | (if count > threshold { 1 } else { 0 }) << i
+        })
+    }
+
+    #[test]
+    fn test_kernels_match_reference() {
+        // Skew towards set bits so the result isn't dominated by noise
+        let hashes: Vec<u64> = random_hashes().take(2000).map(|h| h | (h >> 3)).collect();
+        for len in [0, 1, 2, 3, 254, 255, 256, 510, 1999, 2000] {
+            let hashes = &hashes[..len];
+            let expected = reference(hashes);
+            assert_eq!(simhash_buckets(hashes.iter().copied()), expected);
+            assert_eq!(simhash_buckets_scalar(hashes.iter().copied()), expected);
+            #[cfg(target_arch = "x86_64")]
+            {
+                if std::is_x86_feature_detected!("avx2") {
+                    assert_eq!(unsafe { simhash_buckets_avx2(hashes.iter().copied()) }, expected);
+                }
+                if std::is_x86_feature_detected!("avx512bw") {
+                    assert_eq!(unsafe { simhash_buckets_avx512(hashes.iter().copied()) }, expected);
+                }
+            }
+        }
+    }
+
+    #[test]
+    fn test_all_set() {
+        assert_eq!(simhash_buckets(std::iter::repeat(u64::MAX).take(1000)), u64::MAX);
+        assert_eq!(simhash_buckets(std::iter::repeat(1 << 63).take(300)), 1 << 63);
+    }
+}
@@ -1,5 +1,5 @@
 use pyo3::pyclass;
-use unicode_segmentation::UnicodeSegmentation;
+use unicode_segmentation::{GraphemeCursor, UnicodeSegmentation};
 
 
 #[pyclass]
@@ -22,8 +22,7 @@ impl<T: AsRef<str>> Features for T {
     }
 
     fn grapheme_features(&self) -> impl Iterator<Item = usize> {
-        let grapheme_it = UnicodeSegmentation::grapheme_indices(self.as_ref(), true);
-        grapheme_it.map(|(i, g)| i + g.len()) // return the end index of each grapheme
+        GraphemeEnds::new(self.as_ref()) // return the end index of each grapheme
     }
 
     fn char_features(&self) -> impl Iterator<Item = usize> {
@@ -35,6 +34,43 @@ impl<T: AsRef<str>> Features for T {
     }
 }
 
+// Iterator over the end index of each extended grapheme cluster.
+//
+// The only rule that joins two ASCII characters into one cluster is CR LF (GB3), and no
+// ASCII character can extend or be prepended to a cluster, so an ASCII byte followed by
+// another ASCII byte always ends a cluster.  That case is resolved from the two bytes,
+// everything else is handed to the full segmentation rules in `GraphemeCursor`.
+struct GraphemeEnds<'a> {
+    text: &'a str,
+    pos: usize,
+    cursor: GraphemeCursor,
+}
+
+impl<'a> GraphemeEnds<'a> {
+    fn new(text: &'a str) -> Self {
+        GraphemeEnds { text, pos: 0, cursor: GraphemeCursor::new(0, text.len(), true) }
+    }
+}
+
+impl Iterator for GraphemeEnds<'_> {
+    type Item = usize;
+
+    fn next(&mut self) -> Option<usize> {
+        let bytes = self.text.as_bytes();
+        let &current = bytes.get(self.pos)?;
+        let end = match bytes.get(self.pos + 1) {
+            None if current.is_ascii() => self.pos + 1,
+            Some(&next) if current.is_ascii() && next.is_ascii() && !(current == b'\r' && next == b'\n') => self.pos + 1,
+            _ => {
+                // Only resets the cursor state when the previous cluster came from the fast path
+                self.cursor.set_cursor(self.pos);
+                self.cursor.next_boundary(self.text, 0).unwrap().unwrap()
+            }
+        };
+        self.pos = end;
+        Some(end)
+    }
+}
 
 #[cfg(test)]
 mod tests {
@@ -54,6 +90,18 @@ mod tests {
         assert_eq!(graphemes, vec![3, 6, 11]);
     }
 
+    #[test]
+    fn test_grapheme_features_match_segmentation() {
+        let cases = [
+            "", "a", "\r\n", "a\r\nb\n\r", "e\u{301}x", "\u{600}1 2", "\u{1F1EC}\u{1F1E7}\u{1F1EB}\u{1F1F7}a",
+            "One 🐈‍⬛ sat on the 🪑, the other 🐈‍🟫 was 🏃🏽‍♀️", "हिन्दी text", "한국어 ok", "\u{7f}\u{301}",
+        ];
+        for s in cases {
+            let expected: Vec<usize> = s.grapheme_indices(true).map(|(i, g)| i + g.len()).collect();
+            assert_eq!(s.grapheme_features().collect::<Vec<_>>(), expected, "{:?}", s);
+        }
+    }
+
     #[test]
     fn test_char_features() {
         let s = "hello";
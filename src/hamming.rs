@@ -1,3 +1,4 @@
+use lazy_static::lazy_static;
 
 pub trait IntoU64 {
     fn into_u64(self) -> u64;
@@ -9,6 +10,164 @@ impl IntoU64 for u64 {
     }
 }
 
+#[inline]
 pub fn hamming_distance<T: IntoU64, U: IntoU64>(a: T, b: U) -> u32 {
-    (a.into_u64() ^ b.into_u64()).count_ones()
+    popcount(a.into_u64() ^ b.into_u64())
+}
+
+// Baseline x86_64 does not include POPCNT, so count_ones() lowers to a SWAR
+// bit-twiddling sequence.  Dispatch to the single-instruction version when the
+// CPU has it (std caches the cpuid result, so the check is a load and a branch).
+#[cfg(target_arch = "x86_64")]
+#[inline]
+pub fn popcount(value: u64) -> u32 {
+    if std::is_x86_feature_detected!("popcnt") {
+        unsafe { popcount_popcnt(value) }
+    } else {
+        value.count_ones()
+    }
+}
+
+#[cfg(not(target_arch = "x86_64"))]
+#[inline]
+pub fn popcount(value: u64) -> u32 {
+    value.count_ones()
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "popcnt")]
+unsafe fn popcount_popcnt(value: u64) -> u32 {
+    value.count_ones()
+}
+
+type FindWithinFn = unsafe fn(u64, &[u64], u32) -> Option<usize>;
+
+lazy_static! {
+    // Best scan kernel for this CPU, resolved on first use rather than on every call
+    static ref FIND_WITHIN: FindWithinFn = select_find_within();
+}
+
+#[cfg(target_arch = "x86_64")]
+fn select_find_within() -> FindWithinFn {
+    if std::is_x86_feature_detected!("avx512vpopcntdq") {
+        find_within_avx512
+    } else if std::is_x86_feature_detected!("avx2") {
+        find_within_avx2
+    } else {
+        find_within_scalar
+    }
+}
+
+#[cfg(not(target_arch = "x86_64"))]
+fn select_find_within() -> FindWithinFn {
+    find_within_scalar
+}
+
+/// Returns the index of the first hash in `hashes` within `max_diff` bits of `query`.
+pub fn find_within(query: u64, hashes: &[u64], max_diff: u32) -> Option<usize> {
+    // Safety: select_find_within only returns kernels the CPU supports
+    unsafe { (*FIND_WITHIN)(query, hashes, max_diff) }
+}
+
+fn find_within_scalar(query: u64, hashes: &[u64], max_diff: u32) -> Option<usize> {
+    hashes.iter().position(|&h| popcount(query ^ h) <= max_diff)
+}
+
+// Four hashes per iteration: xor against the broadcast query, popcount each
+// byte with the nibble lookup table (Mula), then sum the bytes of every 64-bit
+// lane with sad_epu8 to get four distances at once.
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2")]
+unsafe fn find_within_avx2(query: u64, hashes: &[u64], max_diff: u32) -> Option<usize> {
+    use std::arch::x86_64::*;
+
+    let lut = _mm256_setr_epi8(
+        0, 1, 1, 2, 1, 2, 2, 3, 1, 2, 2, 3, 2, 3, 3, 4,
+        0, 1, 1, 2, 1, 2, 2, 3, 1, 2, 2, 3, 2, 3, 3, 4,
+    );
+    let low_mask = _mm256_set1_epi8(0x0f);
+    let q = _mm256_set1_epi64x(query as i64);
+    let limit = _mm256_set1_epi64x(max_diff as i64);
+
+    let chunks = hashes.chunks_exact(4);
+    let tail = chunks.remainder();
+    for (i, chunk) in chunks.enumerate() {
+        let v = _mm256_xor_si256(_mm256_loadu_si256(chunk.as_ptr() as *const __m256i), q);
+        let lo = _mm256_and_si256(v, low_mask);
+        let hi = _mm256_and_si256(_mm256_srli_epi16(v, 4), low_mask);
+        let counts = _mm256_add_epi8(_mm256_shuffle_epi8(lut, lo), _mm256_shuffle_epi8(lut, hi));
+        let dists = _mm256_sad_epu8(counts, _mm256_setzero_si256());
+        let over = _mm256_movemask_pd(_mm256_castsi256_pd(_mm256_cmpgt_epi64(dists, limit)));
+        if over != 0b1111 {
+            return Some(i * 4 + (!over).trailing_zeros() as usize);
+        }
+    }
+    find_within_scalar(query, tail, max_diff).map(|i| hashes.len() - tail.len() + i)
+}
+
+// Eight hashes per iteration using the native 64-bit lane popcount, compared
+// straight into a hit mask.  The tail is handled with a masked load.
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx512f,avx512vpopcntdq")]
+unsafe fn find_within_avx512(query: u64, hashes: &[u64], max_diff: u32) -> Option<usize> {
+    use std::arch::x86_64::*;
+
+    let q = _mm512_set1_epi64(query as i64);
+    let limit = _mm512_set1_epi64(max_diff as i64);
+
+    for (i, chunk) in hashes.chunks(8).enumerate() {
+        let valid = (0xffu16 >> (8 - chunk.len())) as __mmask8;
+        let v = _mm512_maskz_loadu_epi64(valid, chunk.as_ptr() as *const i64);
+        let dists = _mm512_popcnt_epi64(_mm512_xor_si512(v, q));
+        let hits = _mm512_mask_cmple_epu64_mask(valid, dists, limit);
+        if hits != 0 {
+            return Some(i * 8 + hits.trailing_zeros() as usize);
+        }
+    }
+    None
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::util::random_hashes;
+
+    #[test]
+    fn test_hamming_distance() {
+        assert_eq!(hamming_distance(0b101010u64, 0b101110u64), 1);
+        assert_eq!(hamming_distance(0u64, u64::MAX), 64);
+        assert_eq!(hamming_distance(u64::MAX, u64::MAX), 0);
+    }
+
+    #[test]
+    fn test_find_within() {
+        let hashes: Vec<u64> = (0..11).map(|i| u64::MAX << i).collect();
+        assert_eq!(find_within(u64::MAX, &hashes, 0), Some(0));
+        assert_eq!(find_within(u64::MAX << 5, &hashes, 0), Some(5));
+        assert_eq!(find_within(u64::MAX << 10, &hashes, 0), Some(10));
+        assert_eq!(find_within(u64::MAX << 10, &hashes, 3), Some(7));
+        assert_eq!(find_within(0, &hashes, 10), None);
+        assert_eq!(find_within(0, &[], 64), None);
+    }
+
+    #[test]
+    fn test_find_within_matches_scalar() {
+        let hashes: Vec<u64> = random_hashes().take(1000).collect();
+        for max_diff in [0, 8, 16, 24, 64] {
+            for &query in hashes.iter().step_by(37) {
+                let query = query ^ 0b1011;
+                let expected = find_within_scalar(query, &hashes, max_diff);
+                assert_eq!(find_within(query, &hashes, max_diff), expected);
+                #[cfg(target_arch = "x86_64")]
+                {
+                    if std::is_x86_feature_detected!("avx2") {
+                        assert_eq!(unsafe { find_within_avx2(query, &hashes, max_diff) }, expected);
+                    }
+                    if std::is_x86_feature_detected!("avx512vpopcntdq") {
+                        assert_eq!(unsafe { find_within_avx512(query, &hashes, max_diff) }, expected);
+                    }
+                }
+            }
+        }
+    }
 }
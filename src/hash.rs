@@ -44,6 +44,9 @@ pub trait ShHash {
             Self::hash_bytes(&bytes[start..end])
         })
     }
+    fn hashing_byte_windows<'a>(source: &'a str, window_size: usize) -> impl Iterator<Item=u64> + 'a {
+        source.as_bytes().windows(window_size).map(|w| Self::hash_bytes(w))
+    }
     fn hashing_windows<'a>(ranges: impl Iterator<Item=Vec<(usize, usize)>> + 'a, source: &'a str) -> impl Iterator<Item=u64> + 'a {
         let bytes = source.as_bytes();
         ranges.map(move |positions| {
@@ -69,27 +72,38 @@ pub fn xxh3_hash_fn<'a, U: AsRef<[u8]> + 'a + ?Sized, T: Iterator<Item=&'a U>>(v
 }
 
 
+// Hashes of a single contiguous input.  Features are mostly a few bytes long, so XXH3
+// uses the one-shot function, which branches straight to its short-input paths, rather
+// than setting up the streaming state (accumulators and a 256 byte buffer) per feature.
+pub fn sip_hash_bytes(bytes: &[u8]) -> u64 {
+    sip_hash_fn(std::iter::once(bytes))
+}
+
+pub fn xxh3_hash_bytes(bytes: &[u8]) -> u64 {
+    xxhash_rust::xxh3::xxh3_64(bytes)
+}
+
 macro_rules! hash_impl {
-    ($name:ident, $hash_fn:path) => {
+    ($name:ident, $hash_fn:path, $hash_bytes_fn:path) => {
         pub mod $name {
             use lazy_static::lazy_static;
             use super::ShHash;
 
             lazy_static! {
-                static ref U16_TABLE: [u64; 65535] = {
-                    let mut dest = [0; 65535];
-                    (0..65535).for_each(|value: u16| {
+                // One entry for every possible value, so lookups by u8/u16 need no bounds check.
+                // Built on the heap: the u16 table is 512KiB.
+                static ref U16_TABLE: Box<[u64; 1 << 16]> = {
+                    let dest: Box<[u64]> = (0..=u16::MAX).map(|value: u16| {
                         let bytes = value.to_le_bytes();
-                        dest[value as usize] = $hash_fn(std::iter::once(&bytes));
-                    });
-                    dest
+                        $hash_bytes_fn(&bytes)
+                    }).collect();
+                    dest.try_into().unwrap()
                 };
-                static ref U8_TABLE: [u64; 255] = {
-                    let mut dest = [0; 255];
-                    (0..255).for_each(|value: u8| {
-                        dest[value as usize] = $hash_fn(std::iter::once(&[value]));
-                    });
-                    dest
+                static ref U8_TABLE: Box<[u64; 1 << 8]> = {
+                    let dest: Box<[u64]> = (0..=u8::MAX).map(|value: u8| {
+                        $hash_bytes_fn(&[value])
+                    }).collect();
+                    dest.try_into().unwrap()
                 };
             }
 
@@ -102,7 +116,7 @@ macro_rules! hash_impl {
                     U16_TABLE[value as usize]
                 }
                 fn hash_bytes(bytes: &[u8]) -> u64 {
-                    $hash_fn(std::iter::once(&bytes))
+                    $hash_bytes_fn(bytes)
                 }
                 fn hash_multi(source: &[u8], slices: Vec<(usize, usize)>) -> u64 {
                     let vals = slices.iter().map(|(start, end)| &source[*start..*end]);
@@ -114,8 +128,8 @@ macro_rules! hash_impl {
     }
 }
 
-hash_impl!(sip_, super::sip_hash_fn);
-hash_impl!(xxh3_, super::xxh3_hash_fn);
+hash_impl!(sip_, super::sip_hash_fn, super::sip_hash_bytes);
+hash_impl!(xxh3_, super::xxh3_hash_fn, super::xxh3_hash_bytes);
 
 
 #[cfg(test)]
@@ -139,6 +153,15 @@ mod tests {
         assert_eq!(v1, xxh3_::Hasher::hash_bytes(b"hello"));
     }
 
+    #[test]
+    fn test_xxh3_one_shot_matches_streaming() {
+        let data: Vec<u8> = (0..=255).collect();
+        for len in 0..data.len() {
+            let bytes = &data[..len];
+            assert_eq!(xxh3_::Hasher::hash_bytes(bytes), xxh3_hash_fn(std::iter::once(bytes)));
+        }
+    }
+
     #[test]
     fn test_hashing_u8() {
         let data = b"bob";
@@ -147,6 +170,27 @@ mod tests {
         assert_eq!(v1, v2);
     }
 
+    #[test]
+    fn test_tables_cover_all_values() {
+        assert_eq!(xxh3_::Hasher::hash_u8(u8::MAX), xxh3_::Hasher::hash_bytes(&[u8::MAX]));
+        assert_eq!(xxh3_::Hasher::hash_u16(u16::MAX), xxh3_::Hasher::hash_bytes(&[u8::MAX, u8::MAX]));
+        assert_eq!(xxh3_::Hasher::hash_u16(0x0201), xxh3_::Hasher::hash_bytes(&[1, 2]));
+    }
+
+    #[test]
+    fn test_byte_windows() {
+        use crate::util::{u16_windows, window_range};
+        let data = "abcé😀e";
+        let v1 = xxh3_::Hasher::hashing_items_u16(u16_windows(data.as_bytes())).collect::<Vec<_>>();
+        let v2 = xxh3_::Hasher::hashing_byte_windows(data, 2).collect::<Vec<_>>();
+        assert_eq!(v1, v2);
+        for n in 3..6 {
+            let v1 = xxh3_::Hasher::hashing_items_range(window_range(data.len(), n), data).collect::<Vec<_>>();
+            let v2 = xxh3_::Hasher::hashing_byte_windows(data, n).collect::<Vec<_>>();
+            assert_eq!(v1, v2);
+        }
+    }
+
     #[test]
     fn test_pairs() {
         use crate::feature::Features;
@@ -5,8 +5,9 @@ mod util;
 mod hash;
 mod feature;
 mod window;
+mod buckets;
 mod simhasher;
-mod tree;
+mod list;
 mod map;
 
 pub use simhasher::SimHasher;
@@ -111,6 +112,14 @@ mod simhash {
             SimHash { value: hash_value }
         }
 
+        fn hash_many(&self, py: Python, inputs: Vec<String>) -> Vec<SimHash> {
+            let hasher = &self.hasher;
+            let hash_values = py.detach(|| {
+                crate::util::parallel_map(&inputs, |input| hasher.hash(input))
+            });
+            hash_values.into_iter().map(|value| SimHash { value }).collect()
+        }
+
         fn features(&self, py: Python, input: &str) -> PyResult<Vec<Py<PyAny>>> {
             let features = (self.hasher.feature_extractor)(input);
             features.into_iter().map(|f| f.clone_into_py(py)).collect::<Result<Vec<_>, _>>()
@@ -121,16 +130,28 @@ mod simhash {
                 self.hasher.clone(),
                 max_diff as u8
             );
-            let mut groups: std::collections::HashMap<usize, Vec<Py<PyAny>>> = std::collections::HashMap::new();
-
-            for text in texts.iter() {
-                let text_val = text.extract::<String>()?;
-
-                let group_val = dict.maybe_insert_close_or(text_val, || groups.len());
-                groups.entry(*group_val).or_default().push(text.into());
+            // Group ids are handed out densely, so they index straight into this
+            let mut groups: Vec<Vec<Py<PyAny>>> = Vec::new();
+
+            // Hashing dominates and each text is independent, so it's done up front across
+            // all cores without the GIL.  Grouping depends on insertion order, so stays serial.
+            // Snapshot the items first: another thread may mutate the list while the GIL is released
+            let items: Vec<Bound<PyAny>> = texts.iter().collect();
+            let text_vals = items.iter().map(|text| text.extract::<String>()).collect::<PyResult<Vec<_>>>()?;
+            let hasher = dict.hasher();
+            let hashes = py.detach(|| {
+                crate::util::parallel_map(&text_vals, |text| hasher.hash(text))
+            });
+
+            for ((text, text_val), hash) in items.into_iter().zip(text_vals).zip(hashes) {
+                let group_val = *dict.maybe_insert_close_or_hashed(text_val, hash, || groups.len());
+                if group_val == groups.len() {
+                    groups.push(Vec::new());
+                }
+                groups[group_val].push(text.into());
             }
 
-            Ok(groups.into_values().collect())
+            Ok(groups)
         }
     }
 
@@ -143,10 +164,17 @@ mod simhash {
         Ok(SimHash { value: hash_value })
     }
 
+    #[pyfunction]
+    #[pyo3(signature = (values, method=HashMethod::XXHash, features=FeatureType::Bytes, n=2 ))]
+    fn hash_many(py: Python, values: Vec<String>, method: HashMethod, features: FeatureType, n: usize) -> PyResult<Vec<SimHash>> {
+        let hasher = SimHasher::new(method, features, n)?;
+        Ok(hasher.hash_many(py, values))
+    }
+
     #[pyfunction]
     #[pyo3(signature = (value, features=FeatureType::Bytes))]
     fn features(py: Python, value: &str, features: FeatureType) -> PyResult<Vec<Py<PyAny>>> {
-        let hasher = crate::simhasher::SimHasher::new(HashMethod::SipHash, features, 1)
+        let hasher = crate::simhasher::SimHasher::new(HashMethod::XXHash, features, 1)
             .map_err(|e| pyo3::exceptions::PyValueError::new_err(e.to_string()))?;
         let features = (hasher.feature_extractor)(value);
         features.into_iter().map(|f| f.clone_into_py(py)).collect::<Result<Vec<_>, _>>()
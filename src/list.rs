@@ -0,0 +1,159 @@
+// Flat, struct-of-arrays store of hash values for similarity search by Hamming distance
+//
+// Hashes are kept in one contiguous `Vec<u64>` and the associated values in a parallel
+// `Vec<T>`, so a search is a straight streaming read over the hashes (eight per cache
+// line) that the SIMD kernels in `hamming::find_within` can consume directly, without
+// touching the values until a match is found.
+//
+// The list searches with a fixed max_diff.  When that is below BANDS and the list grows
+// past INDEX_THRESHOLD entries, a banded index is built as well:
+// - Each hash is split into BANDS bands of BAND_BITS bits
+// - For each band, entries are bucketed by the value of that band
+// - Two hashes that differ in fewer than BANDS bits must agree exactly on at least one
+//   band (pigeonhole), so only the buckets matching the query's bands need scanning,
+//   and the result is identical to a full scan
+// - Random hashes land in each bucket with probability 1/BAND_BUCKETS, so a lookup scans
+//   about N * BANDS / BAND_BUCKETS = N/32 entries: still linear, but a much smaller constant
+// - Larger max_diff values never build the index and always scan everything
+
+use crate::hamming::find_within;
+
+const BAND_BITS: usize = 8;                          // Number of hash bits per band
+const BANDS: usize = 64 / BAND_BITS;                 // Number of bands (and of buckets searched)
+const BAND_BUCKETS: usize = 1 << BAND_BITS;          // Buckets per band
+const INDEX_THRESHOLD: usize = 256;                  // Below this, a full scan is cheaper
+
+// Entries whose hash has a given value in a given band, in insertion order
+#[derive(Default)]
+struct Bucket {
+    hashes: Vec<u64>,
+    ids: Vec<u32>,
+}
+
+#[inline(always)]
+fn band_bucket(hash: u64, band: usize) -> usize {
+    band * BAND_BUCKETS + (hash >> (band * BAND_BITS)) as usize % BAND_BUCKETS
+}
+
+pub struct HashList<T> {
+    hashes: Vec<u64>,     // Stored hash values, in insertion order
+    values: Vec<T>,       // values[i] belongs to hashes[i]
+    bands: Vec<Bucket>,   // BANDS * BAND_BUCKETS buckets, empty until the index is built
+    max_diff: u8,         // Maximum Hamming distance for a match
+}
+
+impl<T> HashList<T> {
+    pub fn new(max_diff: u8) -> Self {
+        Self::with_capacity(max_diff, 0)
+    }
+
+    pub fn with_capacity(max_diff: u8, capacity: usize) -> Self {
+        HashList {
+            hashes: Vec::with_capacity(capacity),
+            values: Vec::with_capacity(capacity),
+            bands: Vec::new(),
+            max_diff,
+        }
+    }
+
+    // Only worth indexing when the pigeonhole argument holds for max_diff
+    fn banded(&self) -> bool {
+        (self.max_diff as usize) < BANDS
+    }
+
+    // Returns the earliest added value whose hash is within max_diff bits of hash
+    pub fn contains(&self, hash: u64) -> Option<&T> {
+        let index = if self.bands.is_empty() {
+            find_within(hash, &self.hashes, self.max_diff as u32)
+        } else {
+            self.find_in_bands(hash, self.max_diff as u32)
+        };
+        index.map(|index| &self.values[index])
+    }
+
+    // Each bucket is in insertion order, so its first hit is its earliest match, and the
+    // earliest over all bands is the same entry a full scan would find
+    fn find_in_bands(&self, hash: u64, max_diff: u32) -> Option<usize> {
+        (0..BANDS).filter_map(|band| {
+            let bucket = &self.bands[band_bucket(hash, band)];
+            find_within(hash, &bucket.hashes, max_diff).map(|i| bucket.ids[i] as usize)
+        }).min()
+    }
+
+    fn index(&mut self, id: usize) {
+        let hash = self.hashes[id];
+        for band in 0..BANDS {
+            let bucket = &mut self.bands[band_bucket(hash, band)];
+            bucket.hashes.push(hash);
+            bucket.ids.push(id as u32);
+        }
+    }
+
+    pub fn add(&mut self, hash: u64, value: T) {
+        self.hashes.push(hash);
+        self.values.push(value);
+
+        let len = self.hashes.len();
+        if !self.banded() {
+            return;
+        }
+        if len == INDEX_THRESHOLD {
+            self.bands.resize_with(BANDS * BAND_BUCKETS, Bucket::default);
+            (0..len).for_each(|id| self.index(id));
+        } else if len > INDEX_THRESHOLD {
+            self.index(len - 1);
+        }
+    }
+
+    #[cfg(test)]
+    pub fn len(&self) -> usize {
+        self.hashes.len()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::util::random_hashes;
+
+    #[test]
+    fn test_contains() {
+        let lists: Vec<HashList<&str>> = (0..=4).map(|max_diff| {
+            let mut list = HashList::new(max_diff);
+            assert_eq!(list.contains(0), None);
+            list.add(0b1111, "a");
+            list.add(0b1111 << 8, "b");
+            list
+        }).collect();
+        assert_eq!(lists[0].len(), 2);
+        assert_eq!(lists[0].contains(0b1111), Some(&"a"));
+        assert_eq!(lists[1].contains(0b0111), Some(&"a"));
+        assert_eq!(lists[0].contains(0b0111), None);
+        assert_eq!(lists[1].contains(0b1110 << 8), Some(&"b"));
+        assert_eq!(lists[4].contains(0), Some(&"a"));
+    }
+
+    #[test]
+    fn test_banded_matches_full_scan() {
+        let mut random = random_hashes();
+        let mut next = || random.next().unwrap();
+        let mut hashes = Vec::new();
+        for i in 0..2000 {
+            // Every so often store a near duplicate of an earlier hash
+            let hash = if i % 5 == 4 { hashes[i / 2] ^ (next() & next() & next()) } else { next() };
+            hashes.push(hash);
+        }
+
+        for max_diff in 0..12 {
+            let mut list = HashList::new(max_diff);
+            hashes.iter().enumerate().for_each(|(i, &hash)| list.add(hash, i));
+            assert_eq!(list.bands.is_empty(), max_diff as usize >= BANDS);
+
+            for (i, &hash) in hashes.iter().enumerate().step_by(7) {
+                let query = hash ^ (1u64 << (i % 64)) ^ (1u64 << (i * 7 % 64));
+                let expected = find_within(query, &hashes, max_diff as u32);
+                assert_eq!(list.contains(query).copied(), expected, "{} {}", i, max_diff);
+            }
+        }
+    }
+}
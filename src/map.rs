@@ -2,38 +2,35 @@ use std::collections::hash_map::{Entry as HashMapEntry};
 use std::collections::HashMap;
 use std::hash::Hash;
 
-use crate::tree::HashTree;
+use crate::list::HashList;
 use crate::{SimHasher};
 
 /// A map that combines exact key lookup with approximate hash matching using SimHash.
 ///
 /// `SimMap` is designed to support workflows where items are indexed by their original
 /// string keys while also being searchable by the similarity of their SimHash values.
-/// It maintains a regular `HashMap` for fast exact lookups and a [`HashTree`] for
+/// It maintains a regular `HashMap` for fast exact lookups and a [`HashList`] for
 /// approximate matching within a configurable Hamming distance.
 pub struct SimMap<K: AsRef<str> + Eq + Hash, T> {
     items: HashMap<K, T>,
-    tree: HashTree<T>,
+    list: HashList<T>,
     hasher: SimHasher,
-    pub max_dist: u8,
 }
 
 impl<K: AsRef<str> + Eq + Hash, T> SimMap<K, T> {
     pub fn new(hasher: SimHasher, max_dist: u8) -> Self {
         Self {
             items: HashMap::new(),
-            tree: HashTree::new(),
+            list: HashList::new(max_dist),
             hasher,
-            max_dist,
         }
     }
 
     pub fn with_capacity(hasher: SimHasher, max_dist: u8, capacity: usize) -> Self {
         Self {
             items: HashMap::with_capacity(capacity),
-            tree: HashTree::new(),
+            list: HashList::with_capacity(max_dist, capacity),
             hasher,
-            max_dist,
         }
     }
 
@@ -69,20 +66,23 @@ impl<K: AsRef<str> + Eq + Hash, T> SimMap<K, T> {
         self.items.get_mut(key)
     }
 
-    pub fn maybe_insert_close_or(&mut self, key: K, f: impl FnOnce() -> T) -> &T
+    /// Returns the value for `key`, inserting one if it's new: the value of the earliest
+    /// added item within `max_dist` of `hash`, or else a new group from `f`.
+    ///
+    /// `hash` must be the key's hash from [`SimMap::hasher`]; taking it precomputed lets
+    /// callers hash in bulk, off the calling thread.
+    pub fn maybe_insert_close_or_hashed(&mut self, key: K, hash: u64, f: impl FnOnce() -> T) -> &T
     where
-        K: AsRef<[u8]>,
         T: Clone,
     {
         match self.items.entry(key) {
             HashMapEntry::Occupied(entry) => entry.into_mut(),
             HashMapEntry::Vacant(entry) => {
-                let hash = self.hasher.hash(entry.key());
-                let value = if let Some(value) = self.tree.contains(hash, self.max_dist) {
+                let value = if let Some(value) = self.list.contains(hash) {
                     value.clone()
                 } else {
                     let value = f();
-                    self.tree.add(hash, value.clone());
+                    self.list.add(hash, value.clone());
                     value
                 };
                 entry.insert(value)
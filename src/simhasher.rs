@@ -3,11 +3,12 @@ use std::fmt::Display;
 use pyo3::{IntoPyObject, Py, PyAny, PyErr, PyObject, PyResult};
 
 use crate::{
+    buckets::simhash_buckets,
     feature::{FeatureType, Features},
     hash::{HashMethod, ShHash},
     hash_dispatch,
-    util::{PairToU16Ext, SequentialToRange, window_range},
-    window::{PairIterExt, SlidingWindowIterExt},
+    util::{SequentialToRange, u16_windows},
+    window::{SequentialSlidingWindowIterExt, SlidingWindowIterExt},
 };
 
 #[derive(PartialEq, Copy, Clone, Debug)]
@@ -58,14 +59,13 @@ fn make_simhasher(
                 }
                 2 => {
                     return Ok(Box::new(move |s: &str| {
-                        let vals = s.byte_features().sliding_pairs().pair_to_u16();
-                        let hashes = <hasher_type!()>::hashing_items_u16(vals);
+                        let hashes = <hasher_type!()>::hashing_items_u16(u16_windows(s.as_bytes()));
                         simhash_impl(hashes)
                     }));
                 }
                 n => {
                     return Ok(Box::new(move |s: &str| {
-                        let hashes = <hasher_type!()>::hashing_items_range(window_range(s.len(), n), s);
+                        let hashes = <hasher_type!()>::hashing_byte_windows(s, n);
                         simhash_impl(hashes)
                     }));
                 }
@@ -80,8 +80,8 @@ fn make_simhasher(
                 }
                 n => {
                     return Ok(Box::new(move |s: &str| {
-                        let windows = s.char_features().sequential_to_range().sliding_window(n);
-                        let hashes = <hasher_type!()>::hashing_windows(windows, s);
+                        let windows = s.char_features().sliding_sequential_window(n);
+                        let hashes = <hasher_type!()>::hashing_items_range(windows, s);
                         simhash_impl(hashes)
                     }));
                 }
@@ -96,8 +96,8 @@ fn make_simhasher(
                 }
                 n => {
                     return Ok(Box::new(move |s: &str| {
-                        let windows = s.grapheme_features().sequential_to_range().sliding_window(n);
-                        let hashes = <hasher_type!()>::hashing_windows(windows, s);
+                        let windows = s.grapheme_features().sliding_sequential_window(n);
+                        let hashes = <hasher_type!()>::hashing_items_range(windows, s);
                         simhash_impl(hashes)
                     }));
                 }
@@ -176,23 +176,7 @@ pub fn make_feature_extractor<'a>(features: FeatureType) -> Box<dyn for<'b> Fn(&
 }
 
 pub fn simhash_impl(hashes: impl Iterator<Item = u64>) -> u64 {
-    let mut feature_adj: u32 = 0;
-    let mut buckets = [0u32; 64];
-
-    for hash in hashes {
-        feature_adj += 1;
-        for i in 0..64 {
-            buckets[i] = buckets[i].saturating_add((hash >> i & 1) as u32);
-        }
-    }
-
-    feature_adj /= 2;
-
-    let val = buckets.iter().enumerate().fold(0, |acc, (i, &b)| {
-        let bitval = (if b > feature_adj { 1 } else { 0 }) << i;
-        acc | bitval
-    });
-    val
+    simhash_buckets(hashes)
 }
 
 pub struct SimHasher {
@@ -221,7 +205,12 @@ impl SimHasher {
     }
 
     pub fn hash<T: AsRef<str>>(&self, text: T) -> u64 {
-        (self.maker)(text.as_ref())
+        let text = text.as_ref();
+        // No features, so no bits can be set
+        if text.is_empty() {
+            return 0;
+        }
+        (self.maker)(text)
     }
 }
 
@@ -234,6 +223,7 @@ impl Clone for SimHasher {
 #[cfg(test)]
 mod tests {
     use super::*;
+    use crate::util::window_range;
     use rstest::*;
 
     #[test]
@@ -257,6 +247,18 @@ mod tests {
         assert_eq!(v1, v2);
     }
 
+    #[rstest]
+    #[case(2)]
+    #[case(3)]
+    fn contiguous_windows_match_sliced(#[case] n: usize) {
+        let val = "a̐éö̲ 🐈‍⬛ sat";
+        let sh = SimHasher::new(HashMethod::SipHash, FeatureType::Graphemes, n).unwrap();
+
+        let windows = val.grapheme_features().sequential_to_range().sliding_window(n);
+        let sliced = simhash_impl(crate::hash::sip_::Hasher::hashing_windows(windows, val));
+        assert_eq!(sh.hash(val), sliced);
+    }
+
     #[rstest]
     #[case(1)]
     #[case(2)]
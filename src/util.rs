@@ -24,15 +24,92 @@ impl <T: Iterator<Item = usize>> Iterator for SequentialToRangeIter<T> {
     }
 }
 
+#[cfg(test)]
 pub trait PairToU16Ext {
     fn pair_to_u16(self) -> impl Iterator<Item = u16>;
 }
+#[cfg(test)]
 impl<T: Iterator<Item = (u8, u8)>> PairToU16Ext for T {
     fn pair_to_u16(self) -> impl Iterator<Item = u16> {
         self.map(|(a, b)| u16::from(b) << 8 | u16::from(a))
     }
 }
 
+#[cfg(test)]
 pub fn window_range(len: usize, window_size: usize) -> impl Iterator<Item = (usize, usize)> {
     (0..=len.saturating_sub(window_size)).map(move |i| (i, i + window_size))
-}
\ No newline at end of file
+}
+
+// Deterministic xorshift64 stream of well mixed u64s, for checking kernels on arbitrary hashes
+#[cfg(test)]
+pub fn random_hashes() -> impl Iterator<Item = u64> {
+    let mut state = 0x9E3779B97F4A7C15u64;
+    std::iter::repeat_with(move || {
+        state ^= state << 13;
+        state ^= state >> 7;
+        state ^= state << 17;
+        state
+    })
+}
+
+// Overlapping byte pairs as little-endian u16s, each is a single unaligned 2-byte load
+pub fn u16_windows(bytes: &[u8]) -> impl Iterator<Item = u16> + '_ {
+    bytes.windows(2).map(|w| u16::from_le_bytes([w[0], w[1]]))
+}
+
+// Items are handed out to worker threads in chunks of this size as they finish
+// previous ones, so uneven item costs (e.g. document lengths) still balance out
+const PARALLEL_CHUNK: usize = 64;
+
+// Minimum input text per worker thread.  Spawning and joining a thread costs tens of
+// microseconds, about as long as hashing this much text takes, so smaller inputs are
+// faster on the calling thread.
+const PARALLEL_MIN_BYTES: usize = 128 * 1024;
+
+// Maps f over texts on the available cores, preserving order.  The number of threads
+// is limited by the total input size, so that each has at least PARALLEL_MIN_BYTES of
+// text to work through; small inputs are mapped on the calling thread.
+pub fn parallel_map<T: AsRef<str> + Sync, U: Send>(items: &[T], f: impl Fn(&T) -> U + Sync) -> Vec<U> {
+    let chunks = items.len().div_ceil(PARALLEL_CHUNK);
+    let total_bytes: usize = items.iter().map(|item| item.as_ref().len()).sum();
+    let threads = std::thread::available_parallelism().map_or(1, |n| n.get())
+        .min(chunks)
+        .min(total_bytes / PARALLEL_MIN_BYTES);
+    if threads <= 1 {
+        return items.iter().map(f).collect();
+    }
+
+    let next_chunk = std::sync::atomic::AtomicUsize::new(0);
+    let mut done: Vec<(usize, Vec<U>)> = std::thread::scope(|scope| {
+        let workers: Vec<_> = (0..threads).map(|_| scope.spawn(|| {
+            let mut done = Vec::new();
+            loop {
+                let chunk = next_chunk.fetch_add(1, std::sync::atomic::Ordering::Relaxed);
+                if chunk >= chunks {
+                    return done;
+                }
+                let start = chunk * PARALLEL_CHUNK;
+                let end = (start + PARALLEL_CHUNK).min(items.len());
+                done.push((chunk, items[start..end].iter().map(&f).collect::<Vec<_>>()));
+            }
+        })).collect();
+        workers.into_iter().flat_map(|worker| worker.join().unwrap()).collect()
+    });
+    done.sort_unstable_by_key(|(chunk, _)| *chunk);
+    done.into_iter().flat_map(|(_, values)| values).collect()
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_parallel_map() {
+        // The largest case is big enough to be split across threads
+        for (len, text_len) in [(0, 0), (1, 10), (PARALLEL_CHUNK + 1, 10), (10_000, 100)] {
+            let items: Vec<String> = (0..len).map(|i| format!("{:1$}", i, text_len)).collect();
+            let expected: Vec<usize> = items.iter().map(|i| i.trim().parse::<usize>().unwrap() * 3).collect();
+            assert_eq!(parallel_map(&items, |i| i.trim().parse::<usize>().unwrap() * 3), expected);
+        }
+    }
+}
@@ -1,10 +1,12 @@
 use std::collections::VecDeque;
 
-
+// Only used by tests, the hashing paths slide over byte slices directly
+#[cfg(test)]
 pub trait PairIterExt<T: Iterator> {
     fn sliding_pairs(self) -> PairsWindowIter<T>;
 }
 
+#[cfg(test)]
 impl<T: Iterator> PairIterExt<T> for T
     where
         T::Item: Clone
@@ -14,10 +16,12 @@ impl<T: Iterator> PairIterExt<T> for T
     }
 }
 
+#[cfg(test)]
 pub struct PairsWindowIter<T: Iterator> {
     inp: T,
     last: Option<T::Item>,
 }
+#[cfg(test)]
 impl <T: Iterator> PairsWindowIter<T>
 where
     T::Item: Clone
@@ -26,6 +30,7 @@ where
         Self { inp, last: None }
     }
 }
+#[cfg(test)]
 impl<T: Iterator> Iterator for PairsWindowIter<T>
 where
     T::Item: Clone
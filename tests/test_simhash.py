@@ -56,12 +56,24 @@ def test_hash_difference():
 
     assert sh1 != sh2
 
+def test_hash_many():
+    texts = ["The cat sat on the mat", "", "a", "The cat spat on the mat"]
+    assert simhash.hash_many(texts) == [simhash.hash(t) for t in texts]
+    assert simhash.hash_many([]) == []
+
+    hasher = simhash.SimHasher(hash_method=simhash.HashMethod.SipHash, features=simhash.FeatureType.Graphemes, n=3)
+    assert hasher.hash_many(texts) == [hasher.hash(t) for t in texts]
+
 def test_odd_ones():
     assert simhash.hash('') == simhash.SimHash.from_int(0)
     assert simhash.hash('', method=simhash.HashMethod.XXHash) == simhash.SimHash.from_int(0)
     assert simhash.hash('a', n=1).value != 0
     assert simhash.hash('a', n=2).value == 0
     assert simhash.hash('a', method=simhash.HashMethod.XXHash, n=1).value != 0
+    # Inputs shorter than the window have no features (these used to panic)
+    assert simhash.hash('ab', n=3).value == 0
+    assert simhash.hash('abc', method=simhash.HashMethod.SipHash, n=8).value == 0
+    assert simhash.hash('ab', n=3).value == simhash.hash('ab', features=simhash.FeatureType.Chars, n=3).value
 
 
 def test_variance():
@@ -149,4 +161,26 @@ def test_grouping():
             "The cat sat on the mat",
             "The cat spat on the mat",
         ],
-    ]
\ No newline at end of file
+    ]
+
+
+def test_grouping_many():
+    texts = [
+        "The cat sat on the mat",
+        "A dog barked all the way to the $MOON",
+        "The cat spat on the mat",
+    ] * 100
+    groups = simhash.group_texts(texts, max_diff=6)
+    assert sorted(groups, key=lambda g: g[0]) == [
+        ["A dog barked all the way to the $MOON"] * 100,
+        ["The cat sat on the mat", "The cat spat on the mat"] * 100,
+    ]
+
+
+def test_grouping_joins_earliest_group():
+    # "fast" is within max_diff of both earlier texts (3 bits from "cat", 6 from "mat"),
+    # which are 7 bits apart and so start separate groups.  It joins whichever group was
+    # created first, not the closest one.
+    cat, mat, fast = "the cat cat cat", "the cat cat mat", "the cat cat fast"
+    assert simhash.group_texts([cat, mat, fast], max_diff=6) == [[cat, fast], [mat]]
+    assert simhash.group_texts([mat, cat, fast], max_diff=6) == [[mat, fast], [cat]]